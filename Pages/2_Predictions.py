@@ -1,39 +1,14 @@
-import pandas as pd
-from sqlalchemy import create_engine
 import plotly.express as px
 import streamlit as st
-from statsmodels.tsa.arima.model import ARIMA
-from dotenv import load_dotenv
-import os
-
-# ----------------------------
-# Database connection
-# ----------------------------
-load_dotenv()  # load variables from .env
-
-DB_USER = os.getenv("DB_USER")
-DB_PASS = os.getenv("DB_PASS")
-DB_HOST = os.getenv("DB_HOST")
-DB_NAME = os.getenv("DB_NAME")
-GEMINI_API_KEY = os.getenv("GEMINI_API_KEY")
-
-engine = create_engine(f"postgresql+psycopg2://{DB_USER}:{DB_PASS}@{DB_HOST}/{DB_NAME}")
+from dashboard_logic import (
+    FORECAST_MAX_DAYS, aggregate_daily_revenue, forecast_revenue, load_forecast_transactions,
+)
+from results_store import load_result
 
 # ----------------------------
 # Load transactions with products & stores
 # ----------------------------
-df = pd.read_sql("""    SELECT t.date, t.total_price, t.location, t.weather, t.promotion_applied,
-           p.product_name, s.store_name
-    FROM transactions t
-    JOIN products p ON t.product_name = p.product_name
-    JOIN stores s ON t.location = s.store_name;
-""", engine)
-
-df['date'] = pd.to_datetime(df['date'])
-
-footfall = pd.read_sql("SELECT date, location, customer_count FROM footfall;", engine)
-footfall['date'] = pd.to_datetime(footfall['date'])
-daily_footfall = footfall.copy()
+df = load_forecast_transactions()
 
 # ----------------------------
 # Streamlit UI: Filters
@@ -49,26 +24,21 @@ products = ["All"] + sorted(df["product_name"].dropna().unique().tolist())
 selected_product = st.selectbox("Select Product", products)
 
 # Forecast horizon input
-n_days = st.slider("Forecast Days", min_value=7, max_value=60, value=14, step=1)
+n_days = st.slider("Forecast Days", min_value=7, max_value=FORECAST_MAX_DAYS, value=14, step=1)
 
 # ----------------------------
-# Apply filters
+# Precomputed results (precompute.py)
 # ----------------------------
-filtered_df = df.copy()
-if selected_store != "All":
-    filtered_df = filtered_df[filtered_df["store_name"] == selected_store]
-if selected_product != "All":
-    filtered_df = filtered_df[filtered_df["product_name"] == selected_product]
+# Stored forecasts cover the longest horizon; any shorter one is its first n_days rows
+precomputed = load_result("forecast", data_end=df["date"].max().date(), store=selected_store, product=selected_product)
 
 # ----------------------------
 # Aggregate daily revenue
 # ----------------------------
-daily_revenue = (
-    filtered_df.groupby("date")["total_price"]
-    .sum()
-    .reset_index()
-    .rename(columns={"total_price": "revenue"})
-)
+if precomputed is not None:
+    daily_revenue = precomputed["daily_revenue"]
+else:
+    daily_revenue = aggregate_daily_revenue(df, selected_store, selected_product)
 
 # Safety check
 if daily_revenue.empty:
@@ -79,13 +49,10 @@ if daily_revenue.empty:
 # Forecast with ARIMA
 # ----------------------------
 try:
-    model = ARIMA(daily_revenue["revenue"], order=(5, 1, 0))
-    model_fit = model.fit()
-
-    # Forecast future
-    forecast = model_fit.forecast(steps=n_days)
-    forecast_dates = pd.date_range(start=daily_revenue["date"].max() + pd.Timedelta(days=1), periods=n_days)
-    forecast_df = pd.DataFrame({"date": forecast_dates, "forecast_revenue": forecast})
+    if precomputed is not None:
+        forecast_df = precomputed["forecast"].head(n_days)
+    else:
+        forecast_df = forecast_revenue(daily_revenue, n_days)
 
     # ----------------------------
     # Plot
@@ -2,43 +2,9 @@ import streamlit as st
 import pandas as pd
 import plotly.express as px
 import numpy as np
-from sqlalchemy import create_engine
-from dotenv import load_dotenv
-import os
+from dashboard_logic import load_products, load_stores
 st.title("🧪 Promotion & Discount Simulator")
 
-# ----------------------------
-# Inputs
-# ----------------------------
-load_dotenv()  # load variables from .env
-
-DB_USER = os.getenv("DB_USER")
-DB_PASS = os.getenv("DB_PASS")
-DB_HOST = os.getenv("DB_HOST")
-DB_NAME = os.getenv("DB_NAME")
-GEMINI_API_KEY = os.getenv("GEMINI_API_KEY")
-
-
-engine = create_engine(f"postgresql+psycopg2://{DB_USER}:{DB_PASS}@{DB_HOST}/{DB_NAME}")
-
-@st.cache_data
-def load_stores():
-    query = """
-    SELECT DISTINCT s.store_name
-    FROM stores s
-    ORDER BY s.store_name;
-    """
-    return pd.read_sql(query, engine)
-
-@st.cache_data
-def load_products():
-    query = """
-    SELECT DISTINCT i.product_name
-    FROM inventory i
-    ORDER BY i.product_name;
-    """
-    return pd.read_sql(query, engine)
-
 # ----------------------------
 # Use them in Streamlit
 # ----------------------------
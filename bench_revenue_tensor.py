@@ -0,0 +1,137 @@
+import argparse
+import os
+import time
+
+import numpy as np
+import pandas as pd
+
+from dashboard_logic import analytics_views
+from revenue_tensor import RevenueTensor
+
+# ---------------------------
+# CONFIG
+# ---------------------------
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "Data")
+TRANSACTION_COLUMNS = [
+    "transaction_id", "datetime", "date", "store", "product", "units_sold", "price", "revenue",
+    "payment_method", "promotion_applied", "weather", "event_holiday",
+]
+
+
+# ---------------------------
+# LOAD DATA
+# ---------------------------
+def load_frames(scale):
+    """Same columns as Analytics.py loads, read from the exported CSVs."""
+    df_sales = pd.read_csv(os.path.join(DATA_DIR, "meama_transactions.csv"), names=TRANSACTION_COLUMNS)
+    # The CSV export has no products table, so group products by their first word
+    df_sales["category"] = df_sales["product"].str.split().str[0].str.lower()
+    df_footfall = pd.read_csv(os.path.join(DATA_DIR, "footfall.csv")).rename(
+        columns={"location": "store", "customer_count": "visitors"})
+    if scale > 1:
+        df_sales = pd.concat([df_sales] * scale, ignore_index=True)
+    for df in [df_sales, df_footfall]:
+        df["date"] = pd.to_datetime(df["date"])
+    return df_sales, df_footfall
+
+
+# ---------------------------
+# QUERY PATHS
+# ---------------------------
+def pandas_views(df_sales, df_footfall, start, end, store, category):
+    """Everything the Analytics page computed per filter change before the tensor (baseline commit)."""
+    mask = (df_sales["date"] >= start) & (df_sales["date"] <= end)
+    if store != "All":
+        mask &= (df_sales["store"] == store)
+    if category != "All":
+        mask &= (df_sales["category"] == category)
+    df_filtered = df_sales.loc[mask]
+
+    mask_footfall = (df_footfall["date"] >= start) & (df_footfall["date"] <= end)
+    if store != "All":
+        mask_footfall &= (df_footfall["store"] == store)
+    df_footfall_filtered = df_footfall.loc[mask_footfall]
+
+    total_units = df_filtered["units_sold"].sum()
+    total_visitors = df_footfall_filtered["visitors"].sum()
+    return {
+        "total_sales": df_filtered["revenue"].sum(),
+        "total_units": total_units,
+        "total_visitors": total_visitors,
+        "conversion_rate": (total_units / total_visitors * 100) if total_visitors > 0 else 0,
+        "sales_time": df_filtered.groupby("date")["revenue"].sum().reset_index(),
+        "sales_product": df_filtered.groupby("product")["units_sold"].sum().reset_index(),
+        "revenue_footfall": df_filtered.groupby("date")["revenue"].sum().reset_index().merge(
+            df_footfall_filtered.groupby("date")["visitors"].sum().reset_index(), on="date", how="left"),
+        "footfall_time": df_footfall_filtered.groupby("date")["visitors"].sum().reset_index(),
+        "store_visitors": df_footfall_filtered.groupby("store")["visitors"].sum().reset_index(),
+        "top_products": df_filtered.groupby("product")["revenue"].sum().reset_index()
+        .sort_values(by="revenue", ascending=False).head(5),
+        "sales_weather": df_filtered.groupby("weather")["revenue"].sum().reset_index(),
+        "merged_weather": df_filtered.groupby(["date", "weather"])["revenue"].sum().reset_index().merge(
+            df_footfall_filtered.groupby("date")["visitors"].sum().reset_index(), on="date", how="left"),
+    }
+
+
+def check(expected, actual):
+    """`analytics_views` must match the groupby frames row for row."""
+    assert expected.keys() == actual.keys()
+    for name, value in expected.items():
+        if isinstance(value, pd.DataFrame):
+            pd.testing.assert_frame_equal(value.reset_index(drop=True), actual[name].reset_index(drop=True),
+                                          check_dtype=False, check_exact=False)
+        else:
+            assert np.isclose(value, actual[name]), name
+
+
+def timed(fn, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+# ---------------------------
+# MAIN
+# ---------------------------
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the Analytics page views: RevenueTensor vs the pandas groupby path")
+    parser.add_argument("--scale", type=int, default=1, help="replicate the transactions N times")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    df_sales, df_footfall = load_frames(args.scale)
+    t0 = time.perf_counter()
+    tensor = RevenueTensor.from_frames(df_sales, df_footfall)
+    build = time.perf_counter() - t0
+    print(f"Rows: {len(df_sales):,} transactions, {len(df_footfall):,} footfall")
+    print(f"Tensor: {tensor.revenue.shape} built in {build * 1000:.1f} ms, {tensor.nbytes / 2**20:.1f} MiB")
+
+    start, end = df_sales["date"].min(), df_sales["date"].max()
+    mid = start + (end - start) / 2
+    filters = [
+        ("all stores, full range", start, end, "All", "All"),
+        ("one store, full range", start, end, df_sales["store"].iloc[0], "All"),
+        ("one category, half range", mid, end, "All", df_sales["category"].iloc[0]),
+        ("one store + category, half range", mid, end, df_sales["store"].iloc[0], df_sales["category"].iloc[0]),
+        ("one store + sparse category", start, end, df_sales["store"].iloc[0], "blue"),
+    ]
+    print(f"{'filter':<36}{'pandas ms':>12}{'tensor ms':>12}{'speedup':>10}")
+    for label, *f in filters:
+        check(pandas_views(df_sales, df_footfall, *f), analytics_views(tensor, *f))
+        t_pandas = timed(lambda: pandas_views(df_sales, df_footfall, *f), args.repeat)
+        t_tensor = timed(lambda: analytics_views(tensor, *f), args.repeat)
+        print(f"{label:<36}{t_pandas * 1000:>12.2f}{t_tensor * 1000:>12.2f}{t_pandas / t_tensor:>9.1f}x")
+
+    # Incremental append of one new day
+    last = df_sales[df_sales["date"] == end].assign(date=end + pd.Timedelta(days=1))
+    last_footfall = df_footfall[df_footfall["date"] == df_footfall["date"].max()]
+    last_footfall = last_footfall.assign(date=last_footfall["date"] + pd.Timedelta(days=1))
+    t_append = timed(lambda: tensor.append(last, last_footfall), 1)
+    print(f"Append one day: {t_append * 1000:.2f} ms -> {tensor.revenue.shape}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,208 @@
+import pandas as pd
+from sqlalchemy import create_engine
+from dotenv import load_dotenv
+import os
+from revenue_tensor import RevenueTensor
+from result_cache import cache, cached
+
+# ---------------------------
+# SHARED PAGE LOGIC
+# ---------------------------
+# Data loading and view computations used by Analytics.py, Pages/2_Predictions.py
+# and the headless precompute pipeline (precompute.py), kept free of Streamlit calls.
+
+# ---------------------------
+# PANDAS SETTINGS
+# ---------------------------
+# Every entry point (all pages, precompute.py) imports this module, so this applies to the
+# whole process: with copy-on-write (default from pandas 3), result_cache can hand out
+# cached DataFrames as shallow views instead of deep copies.
+if int(pd.__version__.split(".")[0]) < 3:
+    pd.set_option("mode.copy_on_write", True)
+
+# ---------------------------
+# DATABASE CONFIG
+# ---------------------------
+load_dotenv()  # load variables from .env
+
+DB_USER = os.getenv("DB_USER")
+DB_PASS = os.getenv("DB_PASS")
+DB_HOST = os.getenv("DB_HOST")
+DB_NAME = os.getenv("DB_NAME")
+
+engine = create_engine(f"postgresql+psycopg2://{DB_USER}:{DB_PASS}@{DB_HOST}/{DB_NAME}")
+
+# ---------------------------
+# LOAD DATA FUNCTIONS
+# ---------------------------
+@cached
+def load_transactions():
+    query = """
+    SELECT t.transaction_id,
+           t.datetime,
+           t.date,
+           s.store_name AS store,
+           p.product_name AS product,
+           p.category AS category,
+           t.quantity AS units_sold,
+           t.unit_price AS price,
+           t.total_price AS revenue,
+           t.payment_method,
+           t.promotion_applied,
+           t.weather,
+           t.event_holiday
+    FROM transactions t
+    JOIN products p ON t.product_name = p.product_name
+    JOIN stores s ON t.location = s.store_name
+    ORDER BY t.date;
+    """
+    return pd.read_sql(query, engine, parse_dates=["date"])
+
+@cached
+def load_footfall():
+    query = """
+    SELECT f.date,
+           s.store_name AS store,
+           f.customer_count AS visitors
+    FROM footfall f
+    JOIN stores s ON f.location = s.store_name
+    ORDER BY f.date;
+    """
+    return pd.read_sql(query, engine, parse_dates=["date"])
+
+@cached
+def load_inventory():
+    query = """
+    SELECT i.date,
+           s.store_name AS store,
+           i.product_name AS product,
+           i.stock_level AS stock_level
+    FROM inventory i
+    JOIN stores s ON i.location = s.store_name
+    ORDER BY i.date;
+    """
+    return pd.read_sql(query, engine, parse_dates=["date"])
+
+@cached
+def load_staffing():
+    query = """
+    SELECT st.date,
+           s.store_name AS store,
+           st.shift,
+           st.staff_count AS staff_count
+    FROM staffing st
+    JOIN stores s ON st.location = s.store_name
+    ORDER BY st.date;
+    """
+    return pd.read_sql(query, engine, parse_dates=["date"])
+
+_tensor_key = {}
+
+
+def data_version(df):
+    """Row count and last date: changes whenever a load brings in new rows."""
+    return len(df), df["date"].max()
+
+
+def load_revenue_tensor():
+    # Shared across sessions: date × store × product arrays behind the KPI and chart views.
+    # Keyed on the frames it is built from, so it is rebuilt whenever they are reloaded
+    # with new data instead of outliving them in its own cache entry.
+    df_sales, df_footfall = load_transactions(), load_footfall()
+    key = ("revenue_tensor", data_version(df_sales), data_version(df_footfall))
+    previous = _tensor_key.get("current")
+    if previous is not None and previous != key:
+        cache.discard(previous)
+    _tensor_key["current"] = key
+    return cache.get(key, lambda: RevenueTensor.from_frames(df_sales, df_footfall))
+
+@cached
+def load_stores():
+    query = """
+    SELECT DISTINCT s.store_name
+    FROM stores s
+    ORDER BY s.store_name;
+    """
+    return pd.read_sql(query, engine)
+
+@cached
+def load_products():
+    query = """
+    SELECT DISTINCT i.product_name
+    FROM inventory i
+    ORDER BY i.product_name;
+    """
+    return pd.read_sql(query, engine)
+
+@cached
+def load_forecast_transactions():
+    query = """
+    SELECT t.date, t.total_price, t.location, t.weather, t.promotion_applied,
+           p.product_name, s.store_name
+    FROM transactions t
+    JOIN products p ON t.product_name = p.product_name
+    JOIN stores s ON t.location = s.store_name;
+    """
+    return pd.read_sql(query, engine, parse_dates=["date"])
+
+# ---------------------------
+# ANALYTICS VIEWS
+# ---------------------------
+def analytics_views(tensor, start, end, store="All", category="All"):
+    """KPIs and chart data for the Analytics page under one set of filters, all from the tensor."""
+    view = dict(start=pd.to_datetime(start), end=pd.to_datetime(end), store=store)
+    total_sales, total_units, total_visitors = tensor.totals(category=category, **view)
+    sales_time = tensor.revenue_over_time(category=category, **view)
+    footfall_time = tensor.visitors_over_time(**view)
+
+    return {
+        "total_sales": total_sales,
+        "total_units": total_units,
+        "total_visitors": total_visitors,
+        "conversion_rate": (total_units / total_visitors * 100) if total_visitors > 0 else 0,
+        "sales_time": sales_time,
+        "sales_product": tensor.units_by_product(category=category, **view),
+        "revenue_footfall": tensor.revenue_over_time(category=category, with_visitors=True, **view),
+        "footfall_time": footfall_time,
+        "store_visitors": tensor.visitors_by_store(**view),
+        "top_products": tensor.top_products(5, category=category, **view),
+        "sales_weather": tensor.revenue_by_weather(category=category, **view),
+        "merged_weather": tensor.revenue_by_date_weather(category=category, with_visitors=True, **view),
+    }
+
+# ---------------------------
+# FORECAST
+# ---------------------------
+FORECAST_MAX_DAYS = 60  # upper bound of the Forecast Days slider
+
+
+def aggregate_daily_revenue(df, store="All", product="All"):
+    filtered_df = df
+    if store != "All":
+        filtered_df = filtered_df[filtered_df["store_name"] == store]
+    if product != "All":
+        filtered_df = filtered_df[filtered_df["product_name"] == product]
+
+    return (
+        filtered_df.groupby("date")["total_price"]
+        .sum()
+        .reset_index()
+        .rename(columns={"total_price": "revenue"})
+    )
+
+
+def forecast_revenue(daily_revenue, n_days):
+    """ARIMA(5,1,0) forecast of `daily_revenue` for the next `n_days` days.
+
+    Multi-step ARIMA forecasts don't depend on the horizon, so the first k rows of a
+    60-day forecast are the k-day forecast.
+    """
+    # statsmodels is slow to import and only the Predictions page / pipeline need it
+    from statsmodels.tsa.arima.model import ARIMA
+
+    model = ARIMA(daily_revenue["revenue"], order=(5, 1, 0))
+    model_fit = model.fit()
+
+    forecast = model_fit.forecast(steps=n_days)
+    forecast_dates = pd.date_range(start=daily_revenue["date"].max() + pd.Timedelta(days=1), periods=n_days)
+    return pd.DataFrame({"date": forecast_dates, "forecast_revenue": forecast})
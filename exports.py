@@ -0,0 +1,202 @@
+import argparse
+import gzip
+import os
+import tempfile
+
+import pandas as pd
+from sqlalchemy import create_engine, text
+from dotenv import load_dotenv
+
+
+# ---------------------------
+# EXPORT QUERIES
+# ---------------------------
+# Exports never build the full result in memory: rows come from a server-side cursor
+# (`stream_results=True`) in fixed-size chunks, and each chunk is appended to a
+# compressed file on disk before the next one is fetched.
+CHUNK_ROWS = 50_000
+
+TRANSACTIONS_QUERY = """
+SELECT t.transaction_id,
+       t.datetime,
+       t.date,
+       s.store_name AS store,
+       p.product_name AS product,
+       p.category AS category,
+       t.quantity AS units_sold,
+       t.unit_price AS price,
+       t.total_price AS revenue,
+       t.payment_method,
+       t.promotion_applied,
+       t.weather,
+       t.event_holiday
+FROM transactions t
+JOIN products p ON t.product_name = p.product_name
+JOIN stores s ON t.location = s.store_name
+WHERE {where}
+ORDER BY t.date, t.transaction_id
+"""
+
+DAILY_QUERY = """
+SELECT t.date,
+       s.store_name AS store,
+       p.product_name AS product,
+       p.category AS category,
+       SUM(t.quantity) AS units_sold,
+       SUM(t.total_price) AS revenue,
+       COUNT(*) AS transactions
+FROM transactions t
+JOIN products p ON t.product_name = p.product_name
+JOIN stores s ON t.location = s.store_name
+WHERE {where}
+GROUP BY t.date, s.store_name, p.product_name, p.category
+ORDER BY t.date, s.store_name, p.product_name
+"""
+
+QUERIES = {"transactions": TRANSACTIONS_QUERY, "daily": DAILY_QUERY}
+COLUMNS = {
+    "transactions": ["transaction_id", "datetime", "date", "store", "product", "category", "units_sold",
+                     "price", "revenue", "payment_method", "promotion_applied", "weather", "event_holiday"],
+    "daily": ["date", "store", "product", "category", "units_sold", "revenue", "transactions"],
+}
+DATE_COLUMNS = {"transactions": ["datetime", "date"], "daily": ["date"]}
+FORMATS = {"csv.gz": "application/gzip", "parquet": "application/vnd.apache.parquet"}
+
+load_dotenv()  # load variables from .env
+
+# Exports over this many rows aren't offered in the app: Streamlit keeps download
+# bytes in memory for the session, so large pulls go through the CLI below instead.
+IN_APP_MAX_ROWS = int(os.getenv("EXPORT_MAX_ROWS", "200000"))
+
+
+def _filtered_query(level, start, end, store="All", category="All"):
+    where = ["t.date BETWEEN :start AND :end"]
+    params = {"start": pd.Timestamp(start).date(), "end": pd.Timestamp(end).date()}
+    if store != "All":
+        where.append("s.store_name = :store")
+        params["store"] = store
+    if category != "All":
+        where.append("p.category = :category")
+        params["category"] = category
+    return text(QUERIES[level].format(where=" AND ".join(where))), params
+
+
+def count_rows(engine, level, start, end, store="All", category="All"):
+    query, params = _filtered_query(level, start, end, store, category)
+    with engine.connect() as conn:
+        return conn.execute(text(f"SELECT COUNT(*) FROM ({query.text}) AS export"), params).scalar()
+
+
+def stream_rows(engine, level, start, end, store="All", category="All", chunksize=CHUNK_ROWS):
+    """Yield DataFrame chunks of transaction-level ("transactions") or aggregated ("daily") rows."""
+    query, params = _filtered_query(level, start, end, store, category)
+    with engine.connect().execution_options(stream_results=True, max_row_buffer=chunksize) as conn:
+        yield from pd.read_sql(query, conn, params=params, chunksize=chunksize, parse_dates=DATE_COLUMNS[level])
+
+
+# ---------------------------
+# WRITERS
+# ---------------------------
+def write_csv_gz(chunks, path, level):
+    rows = 0
+    header = True
+    with gzip.open(path, "wt", encoding="utf-8", newline="") as f:
+        for chunk in chunks:
+            chunk.to_csv(f, header=header, index=False)
+            header = False
+            rows += len(chunk)
+        if header:
+            # No chunks at all: still write the header, as an empty query result does
+            pd.DataFrame(columns=COLUMNS[level]).to_csv(f, index=False)
+    return rows
+
+
+def parquet_schema(level):
+    """Fixed column types per export level, so a chunk whose column is all NULL can't set the file's type."""
+    import pyarrow as pa
+
+    if level == "transactions":
+        return pa.schema([
+            ("transaction_id", pa.int64()),
+            ("datetime", pa.timestamp("us")),
+            ("date", pa.date32()),
+            ("store", pa.string()),
+            ("product", pa.string()),
+            ("category", pa.string()),
+            ("units_sold", pa.int64()),
+            ("price", pa.float64()),
+            ("revenue", pa.float64()),
+            ("payment_method", pa.string()),
+            ("promotion_applied", pa.string()),
+            ("weather", pa.string()),
+            ("event_holiday", pa.string()),
+        ])
+    return pa.schema([
+        ("date", pa.date32()),
+        ("store", pa.string()),
+        ("product", pa.string()),
+        ("category", pa.string()),
+        ("units_sold", pa.int64()),
+        ("revenue", pa.float64()),
+        ("transactions", pa.int64()),
+    ])
+
+
+def write_parquet(chunks, path, level):
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    schema = parquet_schema(level)
+    rows = 0
+    with pq.ParquetWriter(path, schema, compression="zstd") as writer:
+        for chunk in chunks:
+            writer.write_table(pa.Table.from_pandas(chunk, schema=schema, preserve_index=False))
+            rows += len(chunk)
+    return rows
+
+
+WRITERS = {"csv.gz": write_csv_gz, "parquet": write_parquet}
+
+
+def export_to_file(engine, path, fmt, level, start, end, store="All", category="All", chunksize=CHUNK_ROWS):
+    """Stream the filtered rows into `path`. Returns the number of rows written."""
+    return WRITERS[fmt](stream_rows(engine, level, start, end, store, category, chunksize), path, level)
+
+
+def export_to_tempfile(engine, fmt, level, start, end, store="All", category="All"):
+    """Same as `export_to_file`, into a temp file the caller removes. Returns (path, rows)."""
+    fd, path = tempfile.mkstemp(suffix=f".{fmt}", prefix="meama_export_")
+    os.close(fd)
+    try:
+        rows = export_to_file(engine, path, fmt, level, start, end, store, category)
+    except Exception:
+        os.remove(path)
+        raise
+    return path, rows
+
+
+# ---------------------------
+# CLI
+# ---------------------------
+def main():
+    parser = argparse.ArgumentParser(description="Stream a filtered Meama export to CSV.gz or Parquet")
+    parser.add_argument("output")
+    parser.add_argument("--level", choices=sorted(QUERIES), default="transactions")
+    parser.add_argument("--format", choices=sorted(FORMATS), default="csv.gz")
+    parser.add_argument("--start", required=True)
+    parser.add_argument("--end", required=True)
+    parser.add_argument("--store", default="All")
+    parser.add_argument("--category", default="All")
+    parser.add_argument("--chunksize", type=int, default=CHUNK_ROWS)
+    args = parser.parse_args()
+
+    engine = create_engine(
+        f"postgresql+psycopg2://{os.getenv('DB_USER')}:{os.getenv('DB_PASS')}@{os.getenv('DB_HOST')}/{os.getenv('DB_NAME')}"
+    )
+    rows = export_to_file(engine, args.output, args.format, args.level, args.start, args.end,
+                          args.store, args.category, args.chunksize)
+    print(f"Exported {rows:,} rows to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+import argparse
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from dashboard_logic import (
+    FORECAST_MAX_DAYS, aggregate_daily_revenue, analytics_views, forecast_revenue, load_footfall,
+    load_forecast_transactions, load_transactions,
+)
+from results_store import RESULTS_DIR, prune_results, save_result
+from revenue_tensor import RevenueTensor
+
+# ---------------------------
+# HEADLESS PRECOMPUTE PIPELINE
+# ---------------------------
+# Nightly job: computes the default views of Analytics.py (full date range, every
+# store × category) and 2_Predictions.py (every store × product, longest forecast
+# horizon) in parallel and writes them to the results store. "All" counts as a
+# store / category / product, so every filter combination on both pages is covered.
+#
+#   python precompute.py --workers 4
+#
+# Data is loaded once in the parent; each worker process gets a copy at start-up.
+# Stored results of the views that ran but weren't written by this run (older data
+# snapshots, stores / products that no longer exist) are deleted at the end.
+_data = {}
+
+
+def _init_worker(tensor, df_forecast):
+    _data["tensor"] = tensor
+    _data["forecast"] = df_forecast
+
+
+def run_analytics(start, end, store, category):
+    result = analytics_views(_data["tensor"], start, end, store, category)
+    return save_result(result, "analytics", data_end=end.date(), start=start.date(), end=end.date(),
+                       store=store, category=category)
+
+
+def run_forecast(data_end, store, product):
+    history = aggregate_daily_revenue(_data["forecast"], store, product)
+    if history.empty:
+        return None
+    result = {"daily_revenue": history, "forecast": forecast_revenue(history, FORECAST_MAX_DAYS)}
+    return save_result(result, "forecast", data_end=data_end.date(), store=store, product=product)
+
+
+def build_jobs(df_sales, df_forecast, views):
+    jobs = []
+    if "analytics" in views:
+        start, end = df_sales["date"].min(), df_sales["date"].max()
+        for store in ["All"] + df_sales["store"].unique().tolist():
+            for category in ["All"] + df_sales["category"].unique().tolist():
+                jobs.append((run_analytics, (start, end, store, category)))
+    if "forecast" in views:
+        data_end = df_forecast["date"].max()
+        for store in ["All"] + sorted(df_forecast["store_name"].dropna().unique().tolist()):
+            for product in ["All"] + sorted(df_forecast["product_name"].dropna().unique().tolist()):
+                jobs.append((run_forecast, (data_end, store, product)))
+    return jobs
+
+
+# ---------------------------
+# MAIN
+# ---------------------------
+def main():
+    parser = argparse.ArgumentParser(description="Precompute dashboard results for the default views")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: CPU count)")
+    parser.add_argument("--views", nargs="+", choices=["analytics", "forecast"], default=["analytics", "forecast"])
+    args = parser.parse_args()
+
+    t0 = time.perf_counter()
+    df_sales = load_transactions()
+    df_footfall = load_footfall()
+    df_forecast = load_forecast_transactions()
+    print(f"Loaded {len(df_sales):,} transactions in {time.perf_counter() - t0:.1f}s")
+
+    jobs = build_jobs(df_sales, df_forecast, args.views)
+    failed = 0
+    written = []
+    with ProcessPoolExecutor(max_workers=args.workers, initializer=_init_worker,
+                             initargs=(RevenueTensor.from_frames(df_sales, df_footfall), df_forecast)) as pool:
+        futures = {pool.submit(fn, *job_args): (fn.__name__, job_args) for fn, job_args in jobs}
+        for future in as_completed(futures):
+            try:
+                path = future.result()
+            except Exception as e:
+                failed += 1
+                name, job_args = futures[future]
+                print(f"{name}{job_args[1:]} failed: {e}")
+            else:
+                if path is not None:
+                    written.append(path)
+
+    removed = prune_results(args.views, written)
+    print(f"Wrote {len(written)}/{len(jobs)} results to {RESULTS_DIR}, removed {removed} old ones, "
+          f"in {time.perf_counter() - t0:.1f}s")
+    if failed:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,198 @@
+import functools
+import os
+import sys
+import threading
+import time
+from collections import OrderedDict
+from types import MappingProxyType
+
+import numpy as np
+import pandas as pd
+from dotenv import load_dotenv
+
+
+# ---------------------------
+# RESULT CACHE
+# ---------------------------
+# Process-wide cache for datasets and aggregates, shared by every Streamlit session
+# in the worker. Unlike `st.cache_data` it has a memory budget (LRU eviction), an
+# optional TTL, and hands every session the same cached data without letting one
+# session mutate another's: arrays and objects with a `freeze()` hook (RevenueTensor)
+# are made read-only, dicts come back as read-only mappings, and DataFrames as
+# shallow views when pandas copy-on-write is on (deep copies otherwise, see `view`).
+class ResultCache:
+    def __init__(self, max_bytes, ttl=None):
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._entries = OrderedDict()  # key -> (value, nbytes, stored_at)
+        self._lock = threading.Lock()
+        self._loading = {}  # key -> lock, so concurrent misses load once
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.rejected = 0
+
+    def get(self, key, loader, ttl=None):
+        """Return the cached value for `key`, calling `loader()` on a miss."""
+        found, value = self._lookup(key, ttl)
+        if found:
+            return view(value)
+
+        with self._lock:
+            key_lock = self._loading.setdefault(key, threading.Lock())
+        try:
+            with key_lock:
+                # Another session may have loaded it while we waited
+                found, value = self._lookup(key, ttl, count_miss=False)
+                if found:
+                    return view(value)
+                value = freeze(loader())
+                self._store(key, value)
+        finally:
+            with self._lock:
+                self._loading.pop(key, None)
+        return view(value)
+
+    def _lookup(self, key, ttl, count_miss=True):
+        ttl = self.ttl if ttl is None else ttl
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and ttl is not None and time.monotonic() - entry[2] > ttl:
+                self._drop(key)
+                self.expirations += 1
+                entry = None
+            if entry is None:
+                if count_miss:
+                    self.misses += 1
+                return False, None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return True, entry[0]
+
+    def _store(self, key, value):
+        nbytes = estimate_nbytes(value)
+        with self._lock:
+            if key in self._entries:
+                self._drop(key)
+            if nbytes > self.max_bytes:
+                # Bigger than the whole budget: serve it, but don't keep it
+                self.rejected += 1
+                return
+            while self.bytes + nbytes > self.max_bytes:
+                self._drop(next(iter(self._entries)))
+                self.evictions += 1
+            self._entries[key] = (value, nbytes, time.monotonic())
+            self.bytes += nbytes
+
+    def _drop(self, key):
+        _, nbytes, _ = self._entries.pop(key)
+        self.bytes -= nbytes
+
+    def discard(self, key):
+        with self._lock:
+            if key in self._entries:
+                self._drop(key)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.bytes = 0
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "bytes": self.bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "rejected": self.rejected,
+            }
+
+
+# ---------------------------
+# HELPERS
+# ---------------------------
+def estimate_nbytes(value):
+    if isinstance(value, pd.DataFrame):
+        return int(value.memory_usage(index=True, deep=True).sum())
+    if isinstance(value, pd.Series):
+        return int(value.memory_usage(index=True, deep=True))
+    if isinstance(value, np.ndarray):
+        return value.nbytes
+    if hasattr(value, "nbytes"):
+        return int(value.nbytes)
+    if isinstance(value, (dict, MappingProxyType)):
+        return sys.getsizeof(value) + sum(estimate_nbytes(v) for v in value.values())
+    if isinstance(value, (list, tuple)):
+        return sys.getsizeof(value) + sum(estimate_nbytes(v) for v in value)
+    return sys.getsizeof(value)
+
+
+def freeze(value):
+    """Make a value read-only before it is shared between sessions."""
+    if isinstance(value, np.ndarray):
+        value.flags.writeable = False
+    elif isinstance(value, dict):
+        for item in value.values():
+            freeze(item)
+    elif isinstance(value, (list, tuple)):
+        for item in value:
+            freeze(item)
+    elif callable(getattr(value, "freeze", None)):
+        value.freeze()
+    return value
+
+
+def copy_on_write_enabled():
+    if int(pd.__version__.split(".")[0]) >= 3:
+        return True
+    return pd.get_option("mode.copy_on_write") is True
+
+
+def view(value):
+    """What a caller gets on a hit.
+
+    DataFrames / Series are shallow copies when copy-on-write is on (dashboard_logic.py
+    turns it on), so writes only ever copy the touched column; without it a
+    shallow copy would write through to the cached frame, so they are deep-copied.
+    Dicts become read-only mappings, lists / tuples tuples, of views of their items.
+    """
+    if isinstance(value, (pd.DataFrame, pd.Series)):
+        return value.copy(deep=not copy_on_write_enabled())
+    if isinstance(value, dict):
+        return MappingProxyType({k: view(v) for k, v in value.items()})
+    if isinstance(value, (list, tuple)):
+        return tuple(view(v) for v in value)
+    return value
+
+
+# ---------------------------
+# SHARED INSTANCE
+# ---------------------------
+load_dotenv()  # load variables from .env
+
+CACHE_MAX_MB = float(os.getenv("CACHE_MAX_MB", "512"))
+CACHE_TTL = os.getenv("CACHE_TTL")  # seconds; unset = no expiry
+
+cache = ResultCache(int(CACHE_MAX_MB * 2**20), ttl=float(CACHE_TTL) if CACHE_TTL else None)
+
+
+def cached(func=None, *, ttl=None):
+    """Drop-in for `@st.cache_data` backed by the shared `cache`. Arguments must be hashable."""
+    if func is None:
+        return functools.partial(cached, ttl=ttl)
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        # Page scripts all run as __main__, so key on the defining file too
+        key = (func.__code__.co_filename, func.__qualname__, args, tuple(sorted(kwargs.items())))
+        return cache.get(key, lambda: func(*args, **kwargs), ttl=ttl)
+
+    return wrapper
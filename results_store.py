@@ -0,0 +1,70 @@
+import hashlib
+import json
+import os
+
+import pandas as pd
+from dotenv import load_dotenv
+
+from result_cache import cache
+
+
+# ---------------------------
+# RESULTS STORE
+# ---------------------------
+# Precomputed page results written by precompute.py, one pickle per (view, filters).
+# Filters are part of the key, including the last date in the data, so results from
+# an older snapshot simply stop matching and the pages fall back to live computation.
+load_dotenv()  # load variables from .env
+
+RESULTS_DIR = os.getenv("RESULTS_DIR", os.path.join(os.path.dirname(os.path.abspath(__file__)), "results"))
+
+
+def result_key(view, **filters):
+    params = json.dumps({k: str(v) for k, v in filters.items()}, sort_keys=True)
+    return f"{view}-{hashlib.sha1(params.encode('utf-8')).hexdigest()[:16]}"
+
+
+def _path(key):
+    return os.path.join(RESULTS_DIR, f"{key}.pkl")
+
+
+def save_result(result, view, **filters):
+    os.makedirs(RESULTS_DIR, exist_ok=True)
+    path = _path(result_key(view, **filters))
+    # Write then rename, so a page never reads a half-written result
+    tmp = f"{path}.{os.getpid()}.tmp"
+    pd.to_pickle({"filters": {k: str(v) for k, v in filters.items()}, "result": result}, tmp)
+    os.replace(tmp, path)
+    return path
+
+
+def prune_results(views, keep):
+    """Delete stored results of `views` whose paths aren't in `keep`. Returns how many were removed."""
+    keep = {os.path.abspath(path) for path in keep}
+    removed = 0
+    for name in os.listdir(RESULTS_DIR) if os.path.isdir(RESULTS_DIR) else []:
+        path = os.path.abspath(os.path.join(RESULTS_DIR, name))
+        if name.endswith(".pkl") and name.split("-", 1)[0] in views and path not in keep:
+            os.remove(path)
+            removed += 1
+    return removed
+
+
+def load_result(view, **filters):
+    """The precomputed result for these filters, or None if there isn't one."""
+    key = result_key(view, **filters)
+    path = _path(key)
+    try:
+        mtime = os.path.getmtime(path)
+    except OSError:
+        return None
+
+    def load():
+        return mtime, pd.read_pickle(path)["result"]
+
+    # One cache entry per result: when the pipeline rewrites the file, replace it
+    loaded_mtime, result = cache.get(("results", key), load)
+    if loaded_mtime != mtime:
+        cache.discard(("results", key))
+        _, result = cache.get(("results", key), load)
+    return result
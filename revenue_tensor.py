@@ -0,0 +1,290 @@
+import numpy as np
+import pandas as pd
+
+
+# ---------------------------
+# REVENUE TENSOR
+# ---------------------------
+# Dense in-memory cube of daily revenue / units indexed by date × store × product,
+# plus daily visitors indexed by date × store. Every dashboard chart is a slice of
+# these arrays followed by a sum over one or two axes, so a filter change costs a
+# few NumPy reductions instead of a pandas mask + groupby over transaction rows.
+# Row counts are kept alongside so the views, like the groupbys they replace, only
+# return the days / products / stores that actually have rows under the filters.
+class RevenueTensor:
+    # Axes of every array; `_grow` resizes them all from these
+    _AXES = {
+        "revenue": ("day", "store", "product"),
+        "units": ("day", "store", "product"),
+        "transactions": ("day", "store", "product"),
+        "visitors": ("day", "store"),
+        "footfall_rows": ("day", "store"),
+        # Weather has a handful of values, so it gets its own small cube over categories;
+        # store / category last so the per-weather sums reduce over contiguous memory
+        "weather_revenue": ("day", "weather", "store", "category"),
+        "weather_transactions": ("day", "weather", "store", "category"),
+    }
+    _DTYPES = {
+        "revenue": np.float64, "units": np.int64, "transactions": np.int32,
+        "visitors": np.int64, "footfall_rows": np.int32,
+        "weather_revenue": np.float64, "weather_transactions": np.int32,
+    }
+
+    def __init__(self, start_date, stores, products, categories):
+        self.start_date = pd.Timestamp(start_date).normalize()
+        self.stores = list(stores)
+        self.products = list(products)
+        self.categories = []
+        self.weathers = []
+        self.store_index = {s: i for i, s in enumerate(self.stores)}
+        self.product_index = {p: i for i, p in enumerate(self.products)}
+        self.category_index = {}
+        self.weather_index = {}
+        self.product_category = np.empty(0, dtype=np.int32)
+        for product in self.products:
+            self._add_category(categories.get(product, "Unknown"))
+
+        for name, axes in self._AXES.items():
+            setattr(self, name, np.zeros(self._shape(axes, n_days=0), dtype=self._DTYPES[name]))
+        self.frozen = False
+
+    # ---------------------------
+    # CONSTRUCTION
+    # ---------------------------
+    @classmethod
+    def from_frames(cls, df_sales, df_footfall=None):
+        """Build from the `load_transactions()` / `load_footfall()` frames."""
+        dates = pd.to_datetime(df_sales["date"])
+        if df_footfall is not None and not df_footfall.empty:
+            dates = pd.concat([dates, pd.to_datetime(df_footfall["date"])])
+        categories = df_sales.drop_duplicates("product").set_index("product")["category"].to_dict()
+        tensor = cls(dates.min(), [], [], categories)
+        tensor.append(df_sales, df_footfall)
+        return tensor
+
+    @property
+    def dates(self):
+        return pd.date_range(self.start_date, periods=self.revenue.shape[0], freq="D")
+
+    @property
+    def nbytes(self):
+        return sum(getattr(self, name).nbytes for name in self._AXES)
+
+    def freeze(self):
+        """Make the tensor read-only, e.g. before sharing it between sessions."""
+        for name in self._AXES:
+            getattr(self, name).flags.writeable = False
+        self.product_category.flags.writeable = False
+        self.frozen = True
+        return self
+
+    def copy(self):
+        """Writable deep copy, e.g. to append to a frozen tensor."""
+        tensor = RevenueTensor(self.start_date, self.stores, self.products, {})
+        tensor.categories = list(self.categories)
+        tensor.category_index = dict(self.category_index)
+        tensor.weathers = list(self.weathers)
+        tensor.weather_index = dict(self.weather_index)
+        tensor.product_category = self.product_category.copy()
+        for name in self._AXES:
+            setattr(tensor, name, getattr(self, name).copy())
+        return tensor
+
+    def append(self, df_sales, df_footfall=None):
+        """Add new rows (typically new days) in place, growing any axis as needed.
+
+        Everything that can fail (dates, value conversion) is checked before any label
+        or array is touched, so a rejected append leaves the tensor as it was.
+        """
+        if self.frozen:
+            raise ValueError("RevenueTensor is frozen; append to a copy() instead")
+        has_footfall = df_footfall is not None and not df_footfall.empty
+        footfall_day = None
+
+        day = self._day_codes(df_sales["date"])
+        revenue = df_sales["revenue"].to_numpy(dtype=np.float64)
+        units = df_sales["units_sold"].to_numpy(dtype=np.int64)
+        if has_footfall:
+            footfall_day = self._day_codes(df_footfall["date"])
+            visitors = df_footfall["visitors"].to_numpy(dtype=np.int64)
+
+        if "category" in df_sales:
+            categories = df_sales.drop_duplicates("product").set_index("product")["category"].to_dict()
+        else:
+            categories = {}
+        store = self._codes(df_sales["store"], self.stores, self.store_index)
+        product = self._codes(df_sales["product"], self.products, self.product_index)
+        for name in self.products[len(self.product_category):]:
+            self._add_category(categories.get(name, "Unknown"))
+        if has_footfall:
+            footfall_store = self._codes(df_footfall["store"], self.stores, self.store_index)
+        # Rows without weather are left out of the weather cube, as groupby("weather") drops them
+        rated = df_sales["weather"].notna().to_numpy() if "weather" in df_sales else np.zeros(len(df_sales), bool)
+        weather = self._codes(df_sales["weather"][rated], self.weathers, self.weather_index) if rated.any() else None
+
+        n_days = max([self.revenue.shape[0]]
+                     + [int(d.max()) + 1 for d in (day, footfall_day) if d is not None and len(d)])
+        self._grow(n_days)
+
+        np.add.at(self.revenue, (day, store, product), revenue)
+        np.add.at(self.units, (day, store, product), units)
+        np.add.at(self.transactions, (day, store, product), 1)
+        if weather is not None:
+            cell = (day[rated], weather, store[rated], self.product_category[product[rated]])
+            np.add.at(self.weather_revenue, cell, revenue[rated])
+            np.add.at(self.weather_transactions, cell, 1)
+        if has_footfall:
+            np.add.at(self.visitors, (footfall_day, footfall_store), visitors)
+            np.add.at(self.footfall_rows, (footfall_day, footfall_store), 1)
+        return self
+
+    def _add_category(self, category):
+        if category not in self.category_index:
+            self.category_index[category] = len(self.categories)
+            self.categories.append(category)
+        self.product_category = np.append(self.product_category, self.category_index[category]).astype(np.int32)
+
+    def _day_codes(self, dates):
+        days = (pd.to_datetime(dates).dt.normalize() - self.start_date).dt.days.to_numpy()
+        if len(days) and days.min() < 0:
+            raise ValueError(f"Cannot append dates before {self.start_date.date()}")
+        return days
+
+    @staticmethod
+    def _codes(values, labels, index):
+        for value in pd.unique(values):
+            if value not in index:
+                index[value] = len(labels)
+                labels.append(value)
+        return values.map(index).to_numpy(dtype=np.int64)
+
+    def _shape(self, axes, n_days):
+        sizes = {"day": n_days, "store": len(self.stores), "product": len(self.products),
+                 "category": len(self.categories), "weather": len(self.weathers)}
+        return tuple(sizes[axis] for axis in axes)
+
+    def _grow(self, n_days):
+        for name, axes in self._AXES.items():
+            old = getattr(self, name)
+            shape = self._shape(axes, n_days)
+            if shape == old.shape:
+                continue
+            new = np.zeros(shape, dtype=old.dtype)
+            new[tuple(slice(0, n) for n in old.shape)] = old
+            setattr(self, name, new)
+
+    # ---------------------------
+    # FILTERS
+    # ---------------------------
+    def _day_slice(self, start=None, end=None):
+        lo = 0 if start is None else (pd.Timestamp(start).normalize() - self.start_date).days
+        hi = self.revenue.shape[0] if end is None else (pd.Timestamp(end).normalize() - self.start_date).days + 1
+        lo = min(max(lo, 0), self.revenue.shape[0])
+        hi = min(max(hi, lo), self.revenue.shape[0])
+        return slice(lo, hi)
+
+    def _store_slice(self, store="All"):
+        if store == "All":
+            return slice(None)
+        i = self.store_index.get(store)
+        return slice(0, 0) if i is None else slice(i, i + 1)
+
+    def _product_mask(self, category="All"):
+        if category == "All":
+            return slice(None)
+        return self.product_category == self.category_index.get(category, -1)
+
+    def _cube(self, values, start, end, store, category):
+        return values[self._day_slice(start, end), self._store_slice(store)][:, :, self._product_mask(category)]
+
+    # ---------------------------
+    # QUERIES
+    # ---------------------------
+    def totals(self, start=None, end=None, store="All", category="All"):
+        """Total revenue, units and visitors for the KPI row."""
+        revenue = self._cube(self.revenue, start, end, store, category).sum()
+        units = self._cube(self.units, start, end, store, category).sum()
+        visitors = self.visitors[self._day_slice(start, end), self._store_slice(store)].sum()
+        return float(revenue), int(units), int(visitors)
+
+    def revenue_over_time(self, start=None, end=None, store="All", category="All", with_visitors=False):
+        """Daily revenue, only for days with transactions (as `groupby("date")`).
+
+        `with_visitors` adds that day's visitors, like a left merge with `visitors_over_time`.
+        """
+        days = self._day_slice(start, end)
+        revenue = self._cube(self.revenue, start, end, store, category).sum(axis=(1, 2))
+        active = self._cube(self.transactions, start, end, store, category).sum(axis=(1, 2)) > 0
+        df = pd.DataFrame({"date": self.dates[days][active], "revenue": revenue[active]})
+        if with_visitors:
+            df["visitors"] = self._daily_visitors(start, end, store)[np.flatnonzero(active)]
+        return df
+
+    def _daily_visitors(self, start, end, store):
+        """Visitors per day in the slice, NaN on days without footfall rows (what a left merge leaves)."""
+        days, stores = self._day_slice(start, end), self._store_slice(store)
+        visitors = self.visitors[days, stores].sum(axis=1).astype(np.float64)
+        visitors[self.footfall_rows[days, stores].sum(axis=1) == 0] = np.nan
+        return visitors
+
+    def visitors_over_time(self, start=None, end=None, store="All"):
+        days, stores = self._day_slice(start, end), self._store_slice(store)
+        visitors = self.visitors[days, stores].sum(axis=1)
+        active = self.footfall_rows[days, stores].sum(axis=1) > 0
+        return pd.DataFrame({"date": self.dates[days][active], "visitors": visitors[active]})
+
+    def _by_product(self, values, start, end, store, category):
+        totals = self._cube(values, start, end, store, category).sum(axis=(0, 1))
+        active = self._cube(self.transactions, start, end, store, category).sum(axis=(0, 1)) > 0
+        products = np.asarray(self.products, dtype=object)[self._product_mask(category)]
+        order = np.argsort(products[active], kind="stable")
+        return products[active][order], totals[active][order]
+
+    def units_by_product(self, start=None, end=None, store="All", category="All"):
+        products, units = self._by_product(self.units, start, end, store, category)
+        return pd.DataFrame({"product": products, "units_sold": units})
+
+    def top_products(self, n=5, start=None, end=None, store="All", category="All"):
+        products, revenue = self._by_product(self.revenue, start, end, store, category)
+        top = np.argsort(-revenue, kind="stable")[:n]
+        return pd.DataFrame({"product": products[top], "revenue": revenue[top]})
+
+    def visitors_by_store(self, start=None, end=None, store="All"):
+        days, stores = self._day_slice(start, end), self._store_slice(store)
+        visitors = self.visitors[days, stores].sum(axis=0)
+        active = self.footfall_rows[days, stores].sum(axis=0) > 0
+        names = np.asarray(self.stores[stores], dtype=object)
+        order = np.argsort(names[active], kind="stable")
+        return pd.DataFrame({"store": names[active][order], "visitors": visitors[active][order]})
+
+    def _weather_cube(self, values, start, end, store, category):
+        if category == "All":
+            categories = slice(None)
+        else:
+            i = self.category_index.get(category)
+            categories = slice(0, 0) if i is None else slice(i, i + 1)
+        return values[self._day_slice(start, end), :, self._store_slice(store), categories]
+
+    def revenue_by_weather(self, start=None, end=None, store="All", category="All"):
+        """Revenue per weather, as `groupby("weather")` on the filtered rows."""
+        revenue = self._weather_cube(self.weather_revenue, start, end, store, category).sum(axis=(2, 3)).sum(axis=0)
+        active = self._weather_cube(self.weather_transactions, start, end, store, category).sum(axis=(2, 3)).sum(axis=0) > 0
+        names = np.asarray(self.weathers, dtype=object)
+        order = np.argsort(names[active], kind="stable")
+        return pd.DataFrame({"weather": names[active][order], "revenue": revenue[active][order]})
+
+    def revenue_by_date_weather(self, start=None, end=None, store="All", category="All", with_visitors=False):
+        """Revenue per (date, weather), as `groupby(["date", "weather"])` on the filtered rows."""
+        days = self._day_slice(start, end)
+        revenue = self._weather_cube(self.weather_revenue, start, end, store, category).sum(axis=(2, 3))
+        count = self._weather_cube(self.weather_transactions, start, end, store, category).sum(axis=(2, 3))
+        order = np.argsort(np.asarray(self.weathers, dtype=object), kind="stable")
+        day, weather = np.nonzero(count[:, order] > 0)
+        df = pd.DataFrame({
+            "date": self.dates[days][day],
+            "weather": np.asarray(self.weathers, dtype=object)[order][weather],
+            "revenue": revenue[:, order][day, weather],
+        })
+        if with_visitors:
+            df["visitors"] = self._daily_visitors(start, end, store)[day]
+        return df
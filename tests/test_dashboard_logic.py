@@ -0,0 +1,36 @@
+import pandas as pd
+import pytest
+
+pytest.importorskip("sqlalchemy")
+
+import dashboard_logic
+from result_cache import ResultCache
+
+
+def test_revenue_tensor_follows_reloaded_data(monkeypatch):
+    cache = ResultCache(max_bytes=10_000_000)
+    monkeypatch.setattr(dashboard_logic, "cache", cache)
+    monkeypatch.setattr(dashboard_logic, "_tensor_key", {})
+    sales = pd.DataFrame({
+        "date": pd.to_datetime(["2024-01-01"]),
+        "store": ["A"],
+        "product": ["p"],
+        "category": ["c"],
+        "units_sold": [1],
+        "revenue": [2.5],
+    })
+    frames = {"sales": sales}
+    monkeypatch.setattr(dashboard_logic, "load_transactions", lambda: frames["sales"])
+    monkeypatch.setattr(dashboard_logic, "load_footfall", lambda: pd.DataFrame(columns=["date", "store", "visitors"]))
+
+    assert dashboard_logic.load_revenue_tensor().totals()[0] == pytest.approx(2.5)
+    assert dashboard_logic.load_revenue_tensor() is not None
+    assert cache.stats()["hits"] == 1
+
+    # The frames' cache entry expires and the reload brings a new day
+    new_day = sales.assign(date=pd.to_datetime(["2024-01-02"]), revenue=[4.0])
+    frames["sales"] = pd.concat([sales, new_day], ignore_index=True)
+    tensor = dashboard_logic.load_revenue_tensor()
+    assert tensor.totals()[0] == pytest.approx(6.5)
+    assert len(tensor.dates) == 2
+    assert cache.stats()["entries"] == 1
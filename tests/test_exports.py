@@ -0,0 +1,108 @@
+import gzip
+
+import pandas as pd
+import pytest
+
+sqlalchemy = pytest.importorskip("sqlalchemy")
+
+from exports import COLUMNS, count_rows, export_to_file, parquet_schema, write_csv_gz, write_parquet
+
+
+def daily_chunk(rows):
+    df = pd.DataFrame(rows, columns=COLUMNS["daily"])
+    df["date"] = pd.to_datetime(df["date"])
+    return df
+
+
+@pytest.fixture
+def engine():
+    engine = sqlalchemy.create_engine("sqlite://")
+    with engine.begin() as conn:
+        pd.DataFrame({"store_name": ["A", "B"]}).to_sql("stores", conn, index=False)
+        pd.DataFrame({"product_name": ["p", "q"], "category": ["coffee", "tea"]}).to_sql("products", conn, index=False)
+        pd.DataFrame({
+            "transaction_id": [1, 2, 3, 4],
+            "datetime": ["2024-01-01 09:00:00", "2024-01-01 10:00:00", "2024-01-02 09:00:00", "2024-01-03 09:00:00"],
+            "date": ["2024-01-01", "2024-01-01", "2024-01-02", "2024-01-03"],
+            "location": ["A", "A", "B", "A"],
+            "product_name": ["p", "p", "q", "q"],
+            "quantity": [1, 2, 1, 3],
+            "unit_price": [5.0, 5.0, 3.0, 3.0],
+            "total_price": [5.0, 10.0, 3.0, 9.0],
+            "payment_method": ["card", "cash", "card", "card"],
+            "promotion_applied": [None, None, None, None],
+            "weather": ["Sunny", None, "Rainy", "Sunny"],
+            "event_holiday": [None, None, None, None],
+        }).to_sql("transactions", conn, index=False)
+    return engine
+
+
+def test_column_lists_match_parquet_schemas():
+    pytest.importorskip("pyarrow")
+    for level, columns in COLUMNS.items():
+        assert parquet_schema(level).names == columns
+
+
+def test_parquet_keeps_schema_when_first_chunk_is_all_null(tmp_path):
+    pq = pytest.importorskip("pyarrow.parquet")
+    path = tmp_path / "out.parquet"
+    chunks = iter([
+        daily_chunk([("2024-01-01", "A", "p", None, None, None, 1)]),
+        daily_chunk([("2024-01-02", "A", "p", "coffee", 2, 7.5, 1)]),
+    ])
+
+    assert write_parquet(chunks, path, "daily") == 2
+    table = pq.read_table(path)
+    assert table.schema == parquet_schema("daily")
+    assert table.column("category").to_pylist() == [None, "coffee"]
+    assert table.column("revenue").to_pylist() == [None, 7.5]
+
+
+def test_empty_exports_keep_their_columns(tmp_path):
+    pq = pytest.importorskip("pyarrow.parquet")
+    assert write_parquet(iter([]), tmp_path / "out.parquet", "daily") == 0
+    assert pq.read_table(tmp_path / "out.parquet").schema == parquet_schema("daily")
+
+    assert write_csv_gz(iter([]), tmp_path / "out.csv.gz", "daily") == 0
+    with gzip.open(tmp_path / "out.csv.gz", "rt") as f:
+        assert f.read().strip() == ",".join(COLUMNS["daily"])
+
+
+def test_csv_is_written_chunk_by_chunk_with_one_header(tmp_path):
+    path = tmp_path / "out.csv.gz"
+    chunks = (daily_chunk([(f"2024-01-0{i}", "A", "p", "coffee", i, 2.5 * i, 1)]) for i in range(1, 4))
+
+    assert write_csv_gz(chunks, path, "daily") == 3
+    df = pd.read_csv(path)
+    assert df.columns.tolist() == COLUMNS["daily"]
+    assert df["units_sold"].tolist() == [1, 2, 3]
+
+
+@pytest.mark.parametrize("fmt", ["csv.gz", "parquet"])
+def test_export_to_file_streams_filtered_rows(engine, tmp_path, fmt):
+    if fmt == "parquet":
+        pytest.importorskip("pyarrow")
+    path = tmp_path / f"out.{fmt}"
+
+    rows = export_to_file(engine, path, fmt, "transactions", "2024-01-01", "2024-01-02", store="A", chunksize=1)
+
+    assert rows == 2 == count_rows(engine, "transactions", "2024-01-01", "2024-01-02", store="A")
+    df = pd.read_csv(path) if fmt == "csv.gz" else pd.read_parquet(path)
+    assert df.columns.tolist() == COLUMNS["transactions"]
+    assert df["transaction_id"].tolist() == [1, 2]
+    assert df["revenue"].sum() == pytest.approx(15.0)
+
+
+def test_daily_export_aggregates(engine, tmp_path):
+    path = tmp_path / "out.csv.gz"
+    rows = export_to_file(engine, path, "csv.gz", "daily", "2024-01-01", "2024-01-03", category="tea")
+
+    assert rows == 2
+    df = pd.read_csv(path)
+    assert df[["store", "units_sold", "transactions"]].values.tolist() == [["B", 1, 1], ["A", 3, 1]]
+
+
+def test_export_with_no_matching_rows_writes_header(engine, tmp_path):
+    path = tmp_path / "out.csv.gz"
+    assert export_to_file(engine, path, "csv.gz", "transactions", "2025-01-01", "2025-01-31") == 0
+    assert pd.read_csv(path).columns.tolist() == COLUMNS["transactions"]
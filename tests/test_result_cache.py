@@ -0,0 +1,167 @@
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import result_cache
+from result_cache import ResultCache, cached
+from revenue_tensor import RevenueTensor
+
+
+def array(n_bytes):
+    return np.zeros(n_bytes // 8)
+
+
+def test_hit_and_miss_counts():
+    cache = ResultCache(max_bytes=1000)
+    calls = []
+    for _ in range(3):
+        cache.get("a", lambda: calls.append(1) or array(80))
+    assert len(calls) == 1
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["entries"], stats["bytes"]) == (2, 1, 1, 80)
+
+
+def test_lru_eviction_keeps_recently_used():
+    cache = ResultCache(max_bytes=240)
+    cache.get("a", lambda: array(80))
+    cache.get("b", lambda: array(80))
+    cache.get("c", lambda: array(80))
+    cache.get("a", lambda: pytest.fail("a should still be cached"))
+    cache.get("d", lambda: array(80))  # evicts b, the least recently used
+
+    assert cache.stats()["evictions"] == 1
+    assert cache.stats()["bytes"] == 240
+    reloaded = []
+    cache.get("b", lambda: reloaded.append("b") or array(80))
+    assert reloaded == ["b"]
+
+
+def test_ttl_expiry(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr(result_cache.time, "monotonic", lambda: now[0])
+    cache = ResultCache(max_bytes=1000, ttl=10)
+    calls = []
+    loader = lambda: calls.append(1) or array(80)
+
+    cache.get("a", loader)
+    now[0] += 5
+    cache.get("a", loader)
+    now[0] += 10
+    cache.get("a", loader)
+
+    assert len(calls) == 2
+    assert cache.stats()["expirations"] == 1
+
+
+def test_oversized_value_is_served_but_not_kept():
+    cache = ResultCache(max_bytes=100)
+    value = cache.get("big", lambda: array(800))
+    assert value.nbytes == 800
+    stats = cache.stats()
+    assert (stats["rejected"], stats["entries"], stats["bytes"]) == (1, 0, 0)
+
+
+def test_loader_error_is_not_cached_and_releases_key_lock():
+    cache = ResultCache(max_bytes=1000)
+
+    def fail():
+        raise ConnectionError("database down")
+
+    with pytest.raises(ConnectionError):
+        cache.get("a", fail)
+    assert cache._loading == {}
+    assert cache.stats()["entries"] == 0
+    assert cache.get("a", lambda: array(80)).nbytes == 80
+
+
+def test_concurrent_misses_load_once():
+    cache = ResultCache(max_bytes=1000)
+    calls = []
+    start = threading.Barrier(8)
+
+    def loader():
+        calls.append(1)
+        time.sleep(0.05)
+        return array(80)
+
+    def worker():
+        start.wait()
+        cache.get("a", loader)
+
+    threads = [threading.Thread(target=worker) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert len(calls) == 1
+    assert cache._loading == {}
+
+
+def test_cached_arrays_are_read_only():
+    cache = ResultCache(max_bytes=1000)
+    value = cache.get("a", lambda: array(80))
+    with pytest.raises(ValueError):
+        value[0] = 1
+
+
+def test_dataframe_hits_do_not_write_through():
+    cache = ResultCache(max_bytes=10_000)
+    loader = lambda: pd.DataFrame({"x": np.arange(10)})
+    first = cache.get("a", loader)
+    first.loc[0, "x"] = 99
+    assert cache.get("a", loader).loc[0, "x"] == 0
+
+
+def test_dict_results_are_read_only_mappings():
+    cache = ResultCache(max_bytes=10_000)
+    value = cache.get("a", lambda: {"total": 1.0, "series": np.arange(3)})
+    with pytest.raises(TypeError):
+        value["total"] = 2.0
+    with pytest.raises(ValueError):
+        value["series"][0] = 5
+
+
+def test_cached_tensor_is_frozen():
+    df_sales = pd.DataFrame({
+        "date": pd.to_datetime(["2024-01-01", "2024-01-02"]),
+        "store": ["A", "B"],
+        "product": ["p", "q"],
+        "category": ["c", "c"],
+        "units_sold": [1, 2],
+        "revenue": [2.5, 5.0],
+    })
+    cache = ResultCache(max_bytes=10_000)
+    tensor = cache.get("t", lambda: RevenueTensor.from_frames(df_sales))
+
+    assert tensor.frozen
+    with pytest.raises(ValueError):
+        tensor.revenue[0, 0, 0] = 1
+    with pytest.raises(ValueError):
+        tensor.append(df_sales)
+    assert tensor.copy().append(df_sales).totals()[0] == pytest.approx(15.0)
+
+
+def test_cached_decorator_keys_on_arguments(monkeypatch):
+    monkeypatch.setattr(result_cache, "cache", ResultCache(max_bytes=1000))
+    calls = []
+
+    @cached
+    def load(n):
+        calls.append(n)
+        return array(8 * n)
+
+    load(1)
+    load(1)
+    load(2)
+    assert calls == [1, 2]
+
+
+def test_container_sizes_include_their_contents():
+    cache = ResultCache(max_bytes=100_000)
+    frame = pd.DataFrame({"x": np.arange(1000)})
+    cache.get("a", lambda: {"frame": frame, "parts": [array(800), array(800)]})
+    assert cache.stats()["bytes"] >= frame.memory_usage(deep=True).sum() + 1600
@@ -0,0 +1,58 @@
+import os
+
+import pandas as pd
+
+import results_store
+from result_cache import ResultCache
+
+
+def setup_store(monkeypatch, tmp_path):
+    monkeypatch.setattr(results_store, "RESULTS_DIR", str(tmp_path))
+    monkeypatch.setattr(results_store, "cache", ResultCache(max_bytes=10**6))
+
+
+def test_missing_result_is_none(monkeypatch, tmp_path):
+    setup_store(monkeypatch, tmp_path)
+    assert results_store.load_result("analytics", store="All") is None
+
+
+def test_round_trip_matches_on_filters(monkeypatch, tmp_path):
+    setup_store(monkeypatch, tmp_path)
+    result = {"total_sales": 10.0, "sales_time": pd.DataFrame({"revenue": [1.0, 2.0]})}
+    results_store.save_result(result, "analytics", start=pd.Timestamp("2024-01-01").date(), store="All")
+
+    loaded = results_store.load_result("analytics", start="2024-01-01", store="All")
+    assert loaded["total_sales"] == 10.0
+    assert loaded["sales_time"]["revenue"].tolist() == [1.0, 2.0]
+    assert results_store.load_result("analytics", start="2024-01-02", store="All") is None
+
+
+def test_rewritten_result_replaces_cached_entry(monkeypatch, tmp_path):
+    setup_store(monkeypatch, tmp_path)
+    path = results_store.save_result({"total_sales": 1.0}, "analytics", store="All")
+    assert results_store.load_result("analytics", store="All")["total_sales"] == 1.0
+
+    results_store.save_result({"total_sales": 2.0}, "analytics", store="All")
+    os.utime(path, (os.path.getmtime(path) + 10,) * 2)
+
+    assert results_store.load_result("analytics", store="All")["total_sales"] == 2.0
+    assert results_store.cache.stats()["entries"] == 1
+
+
+def test_prune_keeps_this_runs_results_of_the_views_that_ran(monkeypatch, tmp_path):
+    setup_store(monkeypatch, tmp_path)
+    old = results_store.save_result({}, "analytics", data_end="2024-01-01", store="All")
+    new = results_store.save_result({}, "analytics", data_end="2024-01-02", store="All")
+    forecast = results_store.save_result({}, "forecast", data_end="2024-01-01", store="All", product="All")
+    (tmp_path / "notes.txt").write_text("not a result")
+
+    assert results_store.prune_results(["analytics"], [new]) == 1
+    assert not os.path.exists(old)
+    assert os.path.exists(new) and os.path.exists(forecast)
+    assert (tmp_path / "notes.txt").exists()
+    assert results_store.load_result("analytics", data_end="2024-01-01", store="All") is None
+
+
+def test_prune_without_results_dir(monkeypatch, tmp_path):
+    setup_store(monkeypatch, tmp_path / "missing")
+    assert results_store.prune_results(["analytics"], []) == 0
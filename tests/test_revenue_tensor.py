@@ -0,0 +1,75 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from revenue_tensor import RevenueTensor
+
+
+def sales(rows):
+    df = pd.DataFrame(rows, columns=["date", "store", "product", "category", "units_sold", "revenue", "weather"])
+    df["date"] = pd.to_datetime(df["date"])
+    return df
+
+
+def footfall(rows):
+    df = pd.DataFrame(rows, columns=["date", "store", "visitors"])
+    df["date"] = pd.to_datetime(df["date"])
+    return df
+
+
+@pytest.fixture
+def tensor():
+    return RevenueTensor.from_frames(
+        sales([
+            ("2024-01-01", "A", "p", "coffee", 1, 10.0, "Sunny"),
+            ("2024-01-01", "A", "q", "tea", 2, 4.0, "Rainy"),
+            ("2024-01-02", "A", "p", "coffee", 1, 10.0, None),
+        ]),
+        footfall([("2024-01-01", "A", 50), ("2024-01-02", "A", 40)]),
+    )
+
+
+def test_append_new_day_store_and_product(tensor):
+    tensor.append(
+        sales([("2024-01-04", "B", "r", "tea", 3, 9.0, "Sunny")]),
+        footfall([("2024-01-04", "B", 30)]),
+    )
+
+    assert tensor.revenue.shape == (4, 2, 3)
+    assert tensor.stores == ["A", "B"]
+    assert tensor.totals() == pytest.approx((33.0, 7, 120))
+    assert tensor.revenue_over_time()["date"].dt.day.tolist() == [1, 2, 4]
+    assert tensor.units_by_product(store="B").to_dict("list") == {"product": ["r"], "units_sold": [3]}
+    weather = tensor.revenue_by_weather(category="tea")
+    assert weather.to_dict("list") == {"weather": ["Rainy", "Sunny"], "revenue": [4.0, 9.0]}
+
+
+def test_views_only_return_rows_that_exist(tensor):
+    # Only "p" sells on the 2nd, and nothing at all on the 3rd
+    tensor.append(sales([("2024-01-04", "A", "p", "coffee", 1, 0.0, None)]))
+
+    tea = tensor.revenue_over_time(category="tea")
+    assert tea["date"].dt.day.tolist() == [1]
+    # A zero-revenue sale is still a day with rows, as in the groupby
+    assert tensor.revenue_over_time(start="2024-01-02")["date"].dt.day.tolist() == [2, 4]
+    assert tensor.units_by_product(start="2024-01-02")["product"].tolist() == ["p"]
+    assert tensor.units_by_product(category="missing").empty
+    merged = tensor.revenue_over_time(with_visitors=True)
+    assert merged["visitors"].iloc[:2].tolist() == [50, 40]
+    assert np.isnan(merged["visitors"].iloc[2])
+
+
+def test_failed_append_leaves_tensor_unchanged(tensor):
+    before = tensor.copy()
+    with pytest.raises(ValueError):
+        tensor.append(
+            sales([("2024-01-05", "B", "r", "tea", 3, 9.0, "Snow")]),
+            footfall([("2023-12-31", "B", 30)]),
+        )
+
+    assert tensor.stores == before.stores
+    assert tensor.products == before.products
+    assert tensor.weathers == before.weathers
+    for name in RevenueTensor._AXES:
+        np.testing.assert_array_equal(getattr(tensor, name), getattr(before, name))
+    assert tensor.totals() == pytest.approx((24.0, 4, 90))